@@ -1,5 +1,7 @@
 import _io
+import os
 from abc import ABCMeta
+from typing import Union
 
 
 class RawFileIO(metaclass=ABCMeta):
@@ -8,7 +10,7 @@ class RawFileIO(metaclass=ABCMeta):
     주로 with문과 함께 쓰인다.
     """
     file_root: str
-    fd: _io.TextIOWrapper
+    fd: Union[_io.TextIOWrapper, _io.BufferedReader, _io.BufferedWriter]
 
     def __init__(self, file_root: str):
         self.file_root = file_root
@@ -32,4 +34,55 @@ class RawFileRead(RawFileIO):
 class RawFileWrite(RawFileIO):
 
     def __enter__(self, mode: str = None):
-        return super().__enter__('wt')
\ No newline at end of file
+        return super().__enter__('wt')
+
+
+class RawFileBinaryRead(RawFileIO):
+
+    def __enter__(self, mode: str = None):
+        return super().__enter__('rb')
+
+
+class RawFileBinaryWrite(RawFileIO):
+
+    def __enter__(self, mode: str = None):
+        return super().__enter__('wb')
+
+
+class RawFileBinaryAppend(RawFileIO):
+    """
+    binary File의 끝에 이어서 쓴다. 기존 내용은 그대로 남는다.
+    파일이 없으면 새로 만든다.
+    """
+
+    def __enter__(self, mode: str = None):
+        return super().__enter__('ab')
+
+
+class RawFileAtomicWrite(RawFileIO):
+    """
+    binary File을 임시 파일에 먼저 쓴 다음, 쓰기가 끝나면 원래 파일과 교체한다.
+    교체는 os.replace로 한번에 이루어지기 때문에
+    다른 곳에서 파일을 읽어도 쓰다 만 파일을 읽는 일이 없다.
+    쓰는 도중 Exception이 발생하면 원래 파일은 그대로 남는다.
+    """
+
+    def __enter__(self, mode: str = None):
+        self.fd = open(f'{self.file_root}.tmp', mode='wb')
+        return self.fd
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        tmp_root = self.fd.name
+        try:
+            if exc_type is None:
+                # 디스크에 완전히 기록된 다음 교체한다.
+                self.fd.flush()
+                os.fsync(self.fd.fileno())
+        finally:
+            self.fd.close()
+            self.fd = None
+
+        if exc_type is None:
+            os.replace(tmp_root, self.file_root)
+        else:
+            os.remove(tmp_root)
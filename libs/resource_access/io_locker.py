@@ -1,10 +1,11 @@
-from threading import Lock
+from threading import Lock, Condition
 
 
 def lock_while_using_file(locker: Lock):
     """
     파일 접근을 하나의 인스턴스(또는 쓰레드)만 접근할 수 있게 제한하는 데코레이터 함수
     동일한 Lock Instance가 있어야 효과를 볼 수 있다.
+    acquire/release가 있는 객체(ReadWriteLock의 reader, writer 등)도 사용할 수 있다.
     """
     def __lock_while_using_file(func):
         def __wrapper(*args, **kwargs):
@@ -26,3 +27,59 @@ def lock_while_using_file(locker: Lock):
         return __wrapper
 
     return __lock_while_using_file
+
+
+class _LockSide:
+    """
+    ReadWriteLock의 한쪽(읽기 또는 쓰기)을 Lock처럼 사용하기 위한 클래스
+    """
+
+    def __init__(self, acquire, release):
+        self.acquire = acquire
+        self.release = release
+
+
+class ReadWriteLock:
+    """
+    읽기는 여러 쓰레드가 동시에, 쓰기는 하나의 쓰레드만 접근할 수 있게 하는 Lock
+    쓰기를 기다리는 쓰레드가 있으면 새로운 읽기는 대기한다. (쓰기 기아 방지)
+
+    reader, writer는 acquire/release를 제공하기 때문에
+    lock_while_using_file에 그대로 넣어서 사용할 수 있다.
+    """
+    reader: _LockSide
+    writer: _LockSide
+
+    def __init__(self):
+        self.__condition = Condition(Lock())
+        self.__reader_cnt = 0
+        self.__writer_waiting_cnt = 0
+        self.__writing = False
+
+        self.reader = _LockSide(self.__acquire_read, self.__release_read)
+        self.writer = _LockSide(self.__acquire_write, self.__release_write)
+
+    def __acquire_read(self):
+        with self.__condition:
+            while self.__writing or self.__writer_waiting_cnt > 0:
+                self.__condition.wait()
+            self.__reader_cnt += 1
+
+    def __release_read(self):
+        with self.__condition:
+            self.__reader_cnt -= 1
+            if self.__reader_cnt == 0:
+                self.__condition.notify_all()
+
+    def __acquire_write(self):
+        with self.__condition:
+            self.__writer_waiting_cnt += 1
+            while self.__writing or self.__reader_cnt > 0:
+                self.__condition.wait()
+            self.__writer_waiting_cnt -= 1
+            self.__writing = True
+
+    def __release_write(self):
+        with self.__condition:
+            self.__writing = False
+            self.__condition.notify_all()
@@ -1,2 +1,3 @@
 from libs.validator.validator import *
-from libs.validator.validator_chain import *
\ No newline at end of file
+from libs.validator.validator_chain import *
+from libs.validator.cached_validator import *
\ No newline at end of file
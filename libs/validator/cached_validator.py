@@ -0,0 +1,85 @@
+import copy
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable, Optional, Tuple
+
+from libs.validator.validator import Validator
+
+
+class CachedValidator(Validator):
+    """
+    같은 데이터가 반복해서 들어올 경우, 이전 검증 결과를 재사용하는 Validator
+    key 함수로 검증 대상 데이터를 Hashable한 값으로 변환해 결과를 보관하며
+    보관 갯수가 maxsize를 넘으면 가장 오래 사용되지 않은 결과부터 지운다. (LRU)
+    """
+
+    """
+    실제 검증을 수행하는 Validator (Validator, ValidatorChain 등)
+    """
+    validator: Callable
+
+    """
+    검증 대상 데이터를 캐시 key로 변환하는 함수
+    """
+    key: Callable[..., Hashable]
+
+    """
+    보관할 수 있는 최대 검증 결과 갯수
+    """
+    maxsize: int
+
+    def __init__(self,
+                 validator: Callable,
+                 key: Callable[..., Hashable],
+                 maxsize: int = 1024):
+        if not isinstance(validator, Callable):
+            raise TypeError("validator must be Callable")
+        if not isinstance(key, Callable):
+            raise TypeError("key must be Callable Function")
+        self.validator = validator
+        self.key = key
+        self.maxsize = maxsize
+
+        self.__results = OrderedDict()
+        self.__mutex = Lock()
+
+    def __call__(self, *args, **kwargs) \
+            -> (bool, Optional[Exception]):
+        """
+        :param *args or **kwargs: validate데이터
+
+        :return: (True, None) if data is valid
+        :return: (False, Exception) if data is not valid
+        """
+        try:
+            key = self.key(*args, **kwargs)
+            # tuple 안에 list가 있는 경우처럼 key가 Hashable하지 않을 수 있다.
+            hash(key)
+        except Exception:
+            # key로 변환할 수 없는 데이터는 캐시 없이 검증한다.
+            return self.validator(*args, **kwargs)
+
+        with self.__mutex:
+            result = self.__results.get(key)
+            if result is not None:
+                self.__results.move_to_end(key)
+
+        if result is None:
+            result = self.__validate(*args, **kwargs)
+            with self.__mutex:
+                self.__results[key] = result
+                if len(self.__results) > self.maxsize:
+                    self.__results.popitem(last=False)
+
+        is_valid, err = result
+        # 호출한 곳에서 raise를 해도 보관된 Exception에는 영향이 없도록 복사해서 넘긴다.
+        return is_valid, copy.copy(err)
+
+    def __validate(self, *args, **kwargs) \
+            -> Tuple[bool, Optional[Exception]]:
+        """
+        실제 검증을 수행하고 보관할 결과를 만든다.
+        Exception은 Traceback(검증 데이터를 참조하는 Frame)이 없는 복사본으로 보관한다.
+        """
+        is_valid, err = self.validator(*args, **kwargs)
+        return is_valid, copy.copy(err)
@@ -1,5 +1,6 @@
 from abc import ABCMeta, abstractmethod
-from typing import Callable, Optional
+from enum import IntEnum
+from typing import Callable, Optional, Union
 
 
 class Validator(metaclass=ABCMeta):
@@ -28,6 +29,8 @@ class AutomaticValidator(Validator):
 
     """
     validate 로직 함수, 리턴 값이 bool인 함수를 권장한다.
+    실패 원인을 알려줘야 하는 경우 IntEnum 결과 코드를 리턴할 수 있는 데
+    이때 0은 성공, 나머지는 실패가 되며 실패 시 Exception 대신 결과 코드가 그대로 전달된다.
     """
     validate_logic: Callable
 
@@ -40,12 +43,13 @@ class AutomaticValidator(Validator):
         self.validate_logic = validate_logic
 
     def __call__(self, *args, **kwargs) \
-            -> (bool, Optional[Exception]):
+            -> (bool, Optional[Union[Exception, IntEnum]]):
         """
         :param *args or **kwargs: validate데이터
 
         :return: (True, None) if data is valid, then Exception is None
         :return: (False, Exception) if data is not valid, then Exception is returned
+        :return: (False, IntEnum) if validate logic returned non-zero result code
         """
         try:
             # Validate 판별
@@ -56,4 +60,7 @@ class AutomaticValidator(Validator):
 
         if isinstance(is_valid, bool) and not is_valid:
             return False, ValueError("Validate Failed")
+        if isinstance(is_valid, IntEnum) and is_valid != 0:
+            # 결과 코드는 Exception을 만들지 않고 그대로 넘긴다.
+            return False, is_valid
         return True, None
@@ -1,5 +1,5 @@
 from typing import Any, List, Callable, Tuple, Optional
-from libs.validator.validator import AutomaticValidator
+from libs.validator.validator import Validator
 
 
 class ValidatorChain:
@@ -13,13 +13,13 @@ class ValidatorChain:
     이 함수들은 검수 대상의 데이터를 Validator가 원하는 데이터 타입으로 가공하는데 사용되는
     전처리 함수가 된다.
     """
-    validators: List[Tuple[AutomaticValidator, Optional[Callable]]]
+    validators: List[Tuple[Validator, Optional[Callable]]]
 
     def __init__(self):
         self.validators = []
 
     def add_validator(self,
-                      validator: AutomaticValidator,
+                      validator: Validator,
                       pre_procssor: Optional[Callable] = None) \
             -> None:
         """
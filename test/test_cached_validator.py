@@ -0,0 +1,76 @@
+from libs.validator import AutomaticValidator, CachedValidator
+
+
+class CountingLogic:
+    """
+    호출된 횟수를 세는 Validate 로직
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, data):
+        self.calls += 1
+        if data['value'] < 0:
+            raise ValueError('negative')
+        return True
+
+
+def get_validator(maxsize=1024):
+    logic = CountingLogic()
+    validator = CachedValidator(AutomaticValidator(logic),
+                                key=lambda data: tuple(data.items()),
+                                maxsize=maxsize)
+    return validator, logic
+
+
+def test_cache_hit():
+    validator, logic = get_validator()
+    assert validator({'value': 1}) == (True, None)
+    assert validator({'value': 1}) == (True, None)
+    assert logic.calls == 1
+
+
+def test_lru_eviction():
+    validator, logic = get_validator(maxsize=2)
+    validator({'value': 1})
+    validator({'value': 2})
+    # 1을 다시 사용해서 2가 가장 오래 사용되지 않은 결과가 된다.
+    validator({'value': 1})
+    validator({'value': 3})
+    assert logic.calls == 3
+
+    validator({'value': 1})
+    assert logic.calls == 3
+    validator({'value': 2})
+    assert logic.calls == 4
+
+
+def test_unhashable_key_validates_without_cache():
+    validator, logic = get_validator()
+    # tuple 안에 list가 있어 key가 Hashable하지 않다.
+    assert validator({'value': 1, 'tags': ['a']}) == (True, None)
+    assert validator({'value': 1, 'tags': ['a']}) == (True, None)
+    assert logic.calls == 2
+
+    is_valid, err = validator({'value': -1, 'tags': ['a']})
+    assert not is_valid
+    assert isinstance(err, ValueError)
+
+
+def test_cached_error_is_fresh_copy():
+    validator, logic = get_validator()
+    _, first = validator({'value': -1})
+    _, second = validator({'value': -1})
+    assert logic.calls == 1
+    assert isinstance(first, ValueError) and isinstance(second, ValueError)
+    assert first is not second
+    assert first.args == second.args == ('negative',)
+
+    # 호출한 곳에서 raise해도 다음에 받는 Exception에는 영향이 없다.
+    try:
+        raise first
+    except ValueError:
+        pass
+    _, third = validator({'value': -1})
+    assert third.__traceback__ is None
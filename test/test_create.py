@@ -6,10 +6,16 @@ import json
 CREATE_API = '/api/jobs'
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def api():
+    # App 생성은 이 파일의 테스트 전체에서 한번만 수행한다.
     app, api = get_app()
-    yield app.test_client()
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def reset_database():
+    yield
 
     # 테스트 종류 후 실행되는 코드
     # Job.json에 있는 내용들을 전부 지운다
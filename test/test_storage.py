@@ -0,0 +1,210 @@
+import os
+from concurrent.futures import Future
+import pytest
+import orjson
+from api import generate_jobdatabase_engine
+from utils.job_database.io import JOB_DATABASE_LOG_ROOT, JOB_DATABASE_OLD_LOG_ROOT
+
+example_job = {
+    'job_name': 'Job1',
+    'task_list': {
+        'R1': ['R2', 'W1'],
+        'R2': ['W1', 'W2'],
+        'W1': ['W2'],
+        'W2': [],
+    },
+    'property': {
+        'R1': {'task_name': 'read', 'filename': 'a.csv', 'sep': ','},
+        'R2': {'task_name': 'read', 'filename': '1.csv', 'sep': ','},
+        'W1': {'task_name': 'write', 'filename': 'a.csv', 'sep': ','},
+        'W2': {'task_name': 'write', 'filename': 'b.csv', 'sep': ','},
+    }
+}
+
+
+@pytest.fixture
+def engine():
+    engine = generate_jobdatabase_engine()
+    engine.reset()
+    yield engine
+
+    # 테스트 종료 후에 실행되는 코드
+    # Job.json과 로그 파일을 전부 지운다.
+    engine.reset()
+
+
+def reload(engine):
+    """
+    프로그램을 다시 실행한 것처럼 다음 접근 때 파일에서 다시 불러오게 한다.
+    """
+    engine._jobs = None
+
+
+def test_recover_from_old_log(engine):
+    """
+    압축 도중 종료되어 옮겨둔 로그만 남아있는 경우
+    """
+    records = [dict(example_job, job_id=1), dict(example_job, job_id=2), {'job_id': 1}]
+    with open(JOB_DATABASE_OLD_LOG_ROOT, 'wb') as f:
+        f.write(b''.join(orjson.dumps(r) + b'\n' for r in records))
+    reload(engine)
+
+    assert engine.get_item(2)['job_name'] == 'Job1'
+    with pytest.raises(ValueError):
+        engine.get_item(1)
+    # 옮겨둔 로그는 Job.json에 합쳐진 다음 지워진다.
+    assert not os.path.exists(JOB_DATABASE_OLD_LOG_ROOT)
+    assert not os.path.exists(JOB_DATABASE_LOG_ROOT)
+    # 압축할 로그가 없으므로 아무 일도 일어나지 않아야 한다.
+    engine.compact()
+
+    reload(engine)
+    assert engine.get_item(2)['job_name'] == 'Job1'
+    assert engine.save(dict(example_job)) == 3
+
+
+def test_recover_from_log(engine):
+    """
+    압축하지 않고 종료되어 로그 파일만 남아있는 경우
+    """
+    for _ in range(3):
+        engine.save(dict(example_job))
+    engine.remove(2)
+    reload(engine)
+
+    assert engine.get_item(3)['job_id'] == 3
+    with pytest.raises(ValueError):
+        engine.get_item(2)
+    engine.compact()
+    assert not os.path.exists(JOB_DATABASE_LOG_ROOT)
+    assert not os.path.exists(JOB_DATABASE_OLD_LOG_ROOT)
+
+
+def test_failed_log_write_keeps_memory(engine):
+    """
+    로그 파일 기록에 실패하면 메모리의 데이터도 바뀌면 안된다.
+    """
+    job_id = engine.save(dict(example_job))
+    updated_job = dict(example_job, job_name='Job2')
+    # 로그 파일 자리에 폴더를 만들어 기록이 실패하게 한다.
+    os.replace(JOB_DATABASE_LOG_ROOT, f'{JOB_DATABASE_LOG_ROOT}.bak')
+    os.mkdir(JOB_DATABASE_LOG_ROOT)
+    try:
+        with pytest.raises(OSError):
+            engine.save(dict(example_job))
+        with pytest.raises(OSError):
+            engine.update(job_id, updated_job)
+        with pytest.raises(OSError):
+            engine.remove(job_id)
+    finally:
+        os.rmdir(JOB_DATABASE_LOG_ROOT)
+        os.replace(f'{JOB_DATABASE_LOG_ROOT}.bak', JOB_DATABASE_LOG_ROOT)
+
+    assert engine.get_item(job_id)['job_name'] == 'Job1'
+    with pytest.raises(ValueError):
+        engine.get_item(job_id + 1)
+    assert engine.save(dict(example_job)) == job_id + 1
+
+
+def test_deleted_job_id_not_reused_after_reload(engine):
+    """
+    가장 큰 job id의 Job을 삭제하고 다시 불러와도 그 job id는 다시 발급되지 않는다.
+    """
+    for _ in range(3):
+        engine.save(dict(example_job))
+    engine.remove(3)
+    engine.compact()
+    reload(engine)
+
+    assert engine.save(dict(example_job)) == 4
+
+
+def test_recover_from_torn_log(engine):
+    """
+    로그 기록 도중 종료되어 마지막 줄이 잘려 있는 경우
+    잘린 줄은 무시하고, 이후 기록이 잘린 줄에 붙어서 사라지면 안된다.
+    """
+    engine.save(dict(example_job))
+    with open(JOB_DATABASE_LOG_ROOT, 'ab') as f:
+        f.write(b'{"job_id":2,"task_li')
+    reload(engine)
+
+    assert engine.save(dict(example_job)) == 2
+    assert engine.save(dict(example_job)) == 3
+    reload(engine)
+
+    for job_id in (1, 2, 3):
+        assert engine.get_item(job_id)['job_id'] == job_id
+    assert engine.save(dict(example_job)) == 4
+
+
+def test_save_keeps_caller_data(engine):
+    """
+    같은 데이터로 여러번 저장해도 저장된 Job끼리, 그리고 호출한 곳의 데이터와 섞이면 안된다.
+    """
+    job = dict(example_job)
+    assert engine.save(job) == 1
+    assert engine.save(job) == 2
+    assert 'job_id' not in job
+    assert engine.get_item(1)['job_id'] == 1
+
+    updated_job = dict(example_job, job_name='Job2')
+    assert engine.update(1, updated_job)
+    assert 'job_id' not in updated_job
+    engine.compact()
+    reload(engine)
+
+    assert engine.get_item(1)['job_name'] == 'Job2'
+    assert engine.get_item(2)['job_id'] == 2
+
+
+def test_failed_compact_keeps_log(engine):
+    """
+    Job.json 쓰기에 실패한 압축이 반복되어도 아직 합쳐지지 않은 로그를 덮어쓰면 안된다.
+    """
+    tmp_root = 'storage/jobs.json.tmp'
+    engine.save(dict(example_job))
+    engine.save(dict(example_job))
+    # 임시 파일 자리에 폴더를 만들어 Job.json 쓰기가 실패하게 한다.
+    os.mkdir(tmp_root)
+    try:
+        with pytest.raises(OSError):
+            engine.compact()
+        engine.save(dict(example_job))
+        with pytest.raises(OSError):
+            engine.compact()
+    finally:
+        os.rmdir(tmp_root)
+    # 다시 압축하지 않고 종료된 경우
+    reload(engine)
+
+    for job_id in (1, 2, 3):
+        assert engine.get_item(job_id)['job_id'] == job_id
+    engine.compact()
+    assert not os.path.exists(JOB_DATABASE_LOG_ROOT)
+    assert not os.path.exists(JOB_DATABASE_OLD_LOG_ROOT)
+
+
+def test_failed_save_batch_raises_separate_exceptions(engine):
+    """
+    같이 처리된 저장 요청이 실패하면 요청마다 따로 만든 Exception을 받는다.
+    """
+    engine.save(dict(example_job))
+    os.replace(JOB_DATABASE_LOG_ROOT, f'{JOB_DATABASE_LOG_ROOT}.bak')
+    os.mkdir(JOB_DATABASE_LOG_ROOT)
+    try:
+        # 쓰기 Lock을 잡은 상태에서 저장 요청을 쌓아 여러 요청이 한번에 처리되게 한다.
+        futures = [Future() for _ in range(4)]
+        engine.rwlock.writer.acquire()
+        try:
+            for future in futures:
+                engine._save_queue.put((dict(example_job), future))
+        finally:
+            engine.rwlock.writer.release()
+        errors = [future.exception(timeout=5) for future in futures]
+    finally:
+        os.rmdir(JOB_DATABASE_LOG_ROOT)
+        os.replace(f'{JOB_DATABASE_LOG_ROOT}.bak', JOB_DATABASE_LOG_ROOT)
+
+    assert all(isinstance(err, OSError) for err in errors)
+    assert len(set(map(id, errors))) == len(errors)
@@ -1 +1 @@
-from utils.algorithms.topological_sort import topological_sort
\ No newline at end of file
+from utils.algorithms.topological_sort import topological_sort, check_graph
\ No newline at end of file
@@ -1,84 +1,138 @@
 from typing import Dict, List
 import collections
 
+"""
+그래프 검사 결과 코드
+"""
+GRAPH_OK = 0
+GRAPH_NOT_ONE_GRAPH = 1
+GRAPH_NOT_ONE_DESTINATION = 2
+GRAPH_CYCLE = 3
+GRAPH_DOUBLE_EDGE = 4
+GRAPH_UNKNOWN_NODE = 5
 
-def __check_double_edge(g):
-    """
-    출발지에서 목적지로 가는 간선이 두개 이상인 경우 찾기
-    두개 이상이면 Error 호출
-    """
-    for u in g:
-        # u: 출발지
-        v_counter = collections.Counter(g[u])
-        if len(v_counter) == 0:
-            # 목적지가 없는 경우: 끝부분인 경우
-            continue
-        v, n = v_counter.most_common(1)[0]
-        if n > 1:
-            # 출발지에서 목적지로 가는 간선 갯수가 2개 이상이면 안된다.
-            raise ValueError(f"{u} 에서 {v}로 가는 프로세스가 두개 이상이면 안됩니다.")
+GRAPH_ERROR_MESSAGES = {
+    GRAPH_NOT_ONE_GRAPH: "그래프가 두개 이상이면 안됩니다.",
+    GRAPH_NOT_ONE_DESTINATION: "최종 목적지가 두개 이상이면 안됩니다.",
+    GRAPH_CYCLE: "순환 사이클 감지",
+    GRAPH_DOUBLE_EDGE: "같은 목적지로 가는 프로세스가 두개 이상이면 안됩니다.",
+    GRAPH_UNKNOWN_NODE: "목적지가 정점으로 등록되어 있지 않습니다.",
+}
 
 
-def __check_only_one_destination(g):
+def __find_root(roots: List[int], u: int) -> int:
     """
-    최종 목적지가 하나인 지 파악하기
-    이걸로 동시에 그래프 갯수도 판단할 수 있으며
-    그래프가 2개 이상이면 무조건 에러가 발생한다.
+    Union-Find: 정점이 속한 그래프의 대표 정점 구하기
     """
-    end_cnt = 0
-    for u in g:
-        if len(g[u]) == 0:
-            end_cnt += 1
-    if end_cnt > 1:
-        raise ValueError("최종 목적지가 두개 이상이면 안됩니다.")
+    while roots[u] != u:
+        roots[u] = roots[roots[u]]
+        u = roots[u]
+    return u
 
 
-def __get_parents_size(g) -> Dict[str, int]:
+def __intern_graph(g) -> (int, List[str], List[int], List[int]):
     """
-    해당 정점으로부터 부모 정점의 갯수 구하기
+    정점 이름을 0부터 시작하는 정수 id로 바꾸고 그래프를 CSR 형태의 list로 만든다.
+    id가 u인 정점의 목적지들은 indices[indptr[u]:indptr[u + 1]]가 되며
+    목적지의 순서는 입력된 순서 그대로 유지된다.
+
+    * 출발지에서 목적지로 가는 간선이 두개 이상이면 안된다.
+    * 목적지는 정점으로 등록되어 있어야 한다.
+
+    :return: (결과 코드, 정점 이름, indptr, indices)
     """
-    parents_size = {k: 0 for k in g.keys()}
-    for u in g:
-        for v in g[u]:
-            parents_size[v] += 1
-    return parents_size
+    names = list(g)
+    ids = {name: i for i, name in enumerate(names)}
+    indptr, indices = [0], []
+    for vs in g.values():
+        targets = dict.fromkeys(vs)
+        if len(targets) != len(vs):
+            # 출발지에서 목적지로 가는 간선 갯수가 2개 이상이면 안된다.
+            return GRAPH_DOUBLE_EDGE, names, None, None
+        for v in targets:
+            v_id = ids.get(v)
+            if v_id is None:
+                return GRAPH_UNKNOWN_NODE, names, None, None
+            indices.append(v_id)
+        indptr.append(len(indices))
+    return GRAPH_OK, names, indptr, indices
 
 
-def __topological_sort(g, p) -> List[str]:
+def __check_graph(indptr: List[int], indices: List[int]) \
+        -> (int, List[int]):
     """
-    위상 정렬
-    동시에 사이클도 판단한다.
+    CSR 형태의 그래프를 검사하고 위상 정렬을 수행한다.
+    정수 list만 다루며, 실패 시 Exception 대신 결과 코드를 돌려준다.
+
+    정점을 하나씩 다루는 반복문이 대부분이라 numpy 배열은 변환 비용만 늘어나므로
+    (3개 정점에서 약 2배 느리고, 2000개 정점까지도 빨라지지 않음) list를 그대로 사용한다.
+
+    * 그래프는 하나여야 한다. (간선 방향을 무시하고 Union-Find로 묶는다.)
+    * 최종 목적지는 하나여야 한다.
+    * 순환 사이클이 없어야 한다. (위상 정렬로 판단한다.)
+
+    :return: (결과 코드, 위상 정렬된 정점 id)
     """
-    q = collections.deque()
-    n = len(list(g.keys()))
+    n = len(indptr) - 1
+    ptr, idx = indptr, indices
+    # 정점마다 들어오는 간선 수
+    parents_size = [0] * n
+    for v in idx:
+        parents_size[v] += 1
 
-    for k in g:
-        if p[k] == 0:
-            q.appendleft(k)
+    # 간선 (u, v)를 따라 u와 v를 같은 그래프로 묶기
+    roots = list(range(n))
+    for u in range(n):
+        for v in idx[ptr[u]:ptr[u + 1]]:
+            ru, rv = __find_root(roots, u), __find_root(roots, v)
+            if ru != rv:
+                roots[ru] = rv
+    if sum(1 for u in range(n) if roots[u] == u) > 1:
+        return GRAPH_NOT_ONE_GRAPH, []
 
+    # 목적지가 없는 정점: 끝부분
+    if sum(1 for u in range(n) if ptr[u] == ptr[u + 1]) > 1:
+        return GRAPH_NOT_ONE_DESTINATION, []
+
+    # 위상 정렬
+    p = parents_size
+    q = collections.deque(u for u in range(n) if p[u] == 0)
     sorted_data = []
     while q:
-        u = q.pop()
+        u = q.popleft()
         sorted_data.append(u)
 
-        for v in g[u]:
+        for v in idx[ptr[u]:ptr[u + 1]]:
             p[v] -= 1
             if p[v] == 0:
-                q.appendleft(v)
+                q.append(v)
     if len(sorted_data) < n:
-        raise ValueError("순환 사이클 감지")
-    return sorted_data
+        return GRAPH_CYCLE, []
+    return GRAPH_OK, sorted_data
+
+
+def check_graph(g: Dict[str, List[str]]) -> (int, List[str]):
+    """
+    그래프 검사 및 위상 정렬 함수
+    실패 시 Exception 대신 결과 코드를 돌려준다.
+
+    :return: (결과 코드, 위상 정렬된 정점), 실패 시 정점은 빈 list
+    """
+    # 정점을 정수 id로 바꾸면서 중첩 간선 파악하기
+    code, names, indptr, indices = __intern_graph(g)
+    if code != GRAPH_OK:
+        return code, []
+    # 그래프 갯수, 최종 목적지 검사와 위상 정렬 수행(동시에 사이클까지 잡는다.)
+    code, sorted_ids = __check_graph(indptr, indices)
+    return code, [names[u] for u in sorted_ids]
 
 
 def topological_sort(g: Dict[str, List[str]]) -> List[str]:
     """
     위상 정렬 함수
+    그래프가 잘못된 경우 ValueError를 호출한다.
     """
-    # 중첩되는 간선 파악하기
-    __check_double_edge(g)
-    # 최종 목적지가 하나인 지 파악하기
-    __check_only_one_destination(g)
-    # 해당 정점에 대한 부모 정점 갯수 구하기
-    parents_size = __get_parents_size(g)
-    # 위상 정렬 수행(동시에 사이클까지 잡는다.)
-    return __topological_sort(g, parents_size)
+    code, sorted_data = check_graph(g)
+    if code != GRAPH_OK:
+        raise ValueError(GRAPH_ERROR_MESSAGES[code])
+    return sorted_data
@@ -1,15 +1,50 @@
-from threading import Lock
-from typing import Dict, Any, Optional
-import json
+from concurrent.futures import Future
+from threading import Lock, Thread, Timer
+from typing import Dict, Any, Optional, List, Tuple
+import atexit
+import copy
+import queue
 import os
+import orjson
 import pandas as pd
 
-from libs.validator import ValidatorChain
-from libs.resource_access import lock_while_using_file
-from utils.algorithms.job_searcher import search_job_by_binary_search
-from utils.job_database.io import JobDatabaseRead, JobDatabaseWrite
+from libs.validator import CachedValidator
+from libs.resource_access import lock_while_using_file, ReadWriteLock
+from utils.job_database.io import JobDatabaseRead, JobDatabaseWrite, \
+    JobDatabaseLogRead, JobDatabaseLogAppend, \
+    JOB_DATABASE_LOG_ROOT, JOB_DATABASE_OLD_LOG_ROOT
 from utils.job_database.task import TaskWorker
-from utils.validator_chains import get_job_validator_chain
+from utils.validator_chains import get_job_validator_chain, get_job_cache_key
+from utils.validator_logics.job_validator_logics import JOB_ERROR_MESSAGES
+
+"""
+Job Validator는 상태가 없으므로 import 시점에 한번만 생성하고
+모든 요청에서 재사용한다.
+같은 Job Data가 반복해서 들어오면(재시도 등) 이전 검증 결과를 그대로 사용한다.
+"""
+_VALIDATOR = CachedValidator(get_job_validator_chain(), key=get_job_cache_key)
+
+"""
+로그 파일의 기록 수가 Job 수의 COMPACT_RATIO배를 넘으면
+로그를 Job.json에 합쳐서 로그 파일이 끝없이 커지지 않게 한다.
+"""
+COMPACT_RATIO = 2
+
+"""
+로그 압축이 필요해진 후 실제로 압축하기까지 기다리는 시간(초)
+이 시간 동안 들어온 변경 사항은 한번의 압축으로 같이 처리된다.
+"""
+COMPACT_DELAY = 0.05
+
+"""
+저장 요청을 한번에 모아서 처리하는 최대 갯수
+"""
+SAVE_BATCH_SIZE = 64
+
+"""
+Job.json을 사람이 읽기 쉽게 들여쓰기해서 저장할 지 여부 (디버깅용)
+"""
+PRETTY_DATABASE = False
 
 
 class JobDatabaseEngine:
@@ -18,25 +53,73 @@ class JobDatabaseEngine:
     """
 
     """
-    파일 접근은 한번에 하나의 클라이언트가 들어간다.
-    파이썬에서는 동시에 접근할 경우 Error가 발생하기 때문에
-    파일 접근을 시도할 때 먼저 Lock을 걸어둔다.
+    Job 데이터 접근 시 사용되는 Lock
+    쓰기(save, update, remove)는 한번에 하나의 클라이언트만 들어가고
+    로그 압축을 위해 로그 파일을 옮기고 Job 목록을 얻을 때는 읽기로 접근한다.
+    get_item은 Lock 없이 접근한다. (get_item 참고)
     """
-    mutex: Lock
+    rwlock: ReadWriteLock
+
+    """
+    Task 실행 시 storage/data의 csv파일 접근에 사용되는 Lock
+    Task가 실행되는 동안 Job.json 접근이 막히지 않도록 따로 둔다.
+    """
+    task_mutex: Lock
+
+    """
+    Job.json의 내용을 메모리에 보관하고, 요청은 메모리의 데이터로 처리한다.
+    처음 접근할 때 Job.json과 로그 파일에서 불러오며, rwlock으로 보호된다.
+
+    :param _jobs: job id를 key로 하는 Job 데이터, 저장된 순서(job id 오름차순)가 유지된다.
+    :param _next_id: 다음에 발급될 job id
+    :param _log_size: 아직 Job.json에 합쳐지지 않은 로그 기록 수
+    :param _compact_timer: 예약된 로그 압축 작업
+    """
+    _jobs: Optional[Dict[int, Dict[str, Any]]]
+    _next_id: int
+    _log_size: int
+    _compact_timer: Optional[Timer]
+
+    """
+    로그 압축이 동시에 두번 이상 일어나지 않게 막는 Lock
+    rwlock과 같이 사용할 때는 반드시 compact_mutex를 먼저 잡는다.
+    """
+    compact_mutex: Lock
+
+    """
+    저장(save) 요청을 모아서 처리하는 대기열과 쓰레드
+    save는 Job과 결과를 받을 Future를 대기열에 넣고 기다리며,
+    _save_worker가 대기열에 쌓인 요청을 한번에 꺼내서 한번의 로그 쓰기로 처리한다.
+    """
+    _save_queue: queue.Queue
+    _save_worker: Thread
 
     """
     Job 데이터 상태가 유효한지를 파악하기 위한 Validator
     """
-    validator: ValidatorChain
+    validator: CachedValidator
+
+    """
+    Singletone 인스턴스가 동시에 두번 생성되지 않게 막는 Lock
+    """
+    __instance_mutex = Lock()
 
     def __new__(cls):
         """
         많은 트래픽으로 인한 Instance 남발을 줄이기 위해
         Singletone Pattern을 적용하여 하나의 인스턴스만 실행한다.
+
+        __init__은 기존 인스턴스를 돌려줄 때도 매번 호출되기 때문에
+        초기화는 인스턴스를 처음 생성할 때 여기서 한번만 수행한다.
         """
         if not hasattr(cls, 'jobdatabase_instance'):
-            cls.jobdatabase_instance = \
-                super(JobDatabaseEngine, cls).__new__(cls)
+            with cls.__instance_mutex:
+                if not hasattr(cls, 'jobdatabase_instance'):
+                    instance = super(JobDatabaseEngine, cls).__new__(cls)
+                    instance.__initialize()
+                    # 초기화가 끝난 다음에 공개해야 다른 쓰레드가
+                    # 초기화 중인 인스턴스를 사용하지 않는다.
+                    cls.jobdatabase_instance = instance
         return cls.jobdatabase_instance
 
     def __read_from_database(self) -> Dict[str, Any]:
@@ -45,26 +128,216 @@ class JobDatabaseEngine:
         """
         raw_storage = None
         with JobDatabaseRead() as r:
-            raw_storage = json.load(r)
+            raw_storage = orjson.loads(r.read())
         return raw_storage
 
-    def __write_to_database(self, data: Dict[str, Any]):
+    def __dump_database(self, data: Dict[str, Any]) -> bytes:
+        """
+        Json File에 쓸 데이터로 변환하기
+        """
+        option = orjson.OPT_APPEND_NEWLINE
+        if PRETTY_DATABASE:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+    def __write_to_database(self, raw_storage: bytes):
         """
         Json File에 갱신하기
+        임시 파일에 쓴 다음 교체하기 때문에 쓰는 도중에도 기존 파일을 읽을 수 있다.
         """
         with JobDatabaseWrite() as w:
-            json.dump(data, w, indent=4)
+            w.write(raw_storage)
 
-    def __init__(self):
-        self.mutex = Lock()
-        self.validator = get_job_validator_chain()
+    def __read_log(self, file_root: str) -> (List[Dict[str, Any]], int):
+        """
+        로그 파일에서 변경 사항을 한 줄씩 불러오기
+        기록하는 도중 종료되면 마지막 줄이 잘려 있을 수 있으므로, 읽을 수 없는 줄에서 멈춘다.
+
+        :return: (변경 사항, 온전하게 읽은 부분의 크기(byte))
+        """
+        records, valid_size = [], 0
+        if not os.path.exists(file_root):
+            return records, valid_size
+        with JobDatabaseLogRead(file_root) as r:
+            for line in r:
+                # 줄바꿈까지 기록되지 않은 줄은 잘린 줄로 본다.
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    break
+                valid_size += len(line)
+        return records, valid_size
+
+    def __write_to_log(self, records: List[Dict[str, Any]]):
+        """
+        로그 파일 끝에 변경 사항을 한 줄씩 기록하기
+        rwlock.writer를 잡은 상태에서 호출해야 한다.
+        Job 전체가 아닌 변경된 Job만 쓰기 때문에 저장된 Job 수와 상관없이 일정한 시간이 걸린다.
+        기록에 실패하면 메모리의 데이터도 바뀌면 안되므로, 메모리에는 기록이 끝난 다음에 반영한다.
+
+        :param records: 생성/수정은 Job 데이터 그대로, 삭제는 {'job_id': job_id}
+        """
+        with JobDatabaseLogAppend() as w:
+            w.write(b''.join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+                             for record in records))
+        self._log_size += len(records)
+
+    @staticmethod
+    def __apply_log(jobs: Dict[int, Dict[str, Any]], record: Dict[str, Any]):
+        """
+        로그 기록 하나를 Job 데이터에 반영하기
+        job_id만 있는 기록은 삭제, 나머지는 생성/수정으로 처리한다.
+        """
+        job_id = record['job_id']
+        if len(record) == 1:
+            jobs.pop(job_id, None)
+        else:
+            jobs[job_id] = record
+
+    def __initialize(self):
+        """
+        인스턴스 초기화, 인스턴스를 처음 생성할 때 한번만 호출된다.
+        """
+        self.rwlock = ReadWriteLock()
+        self.task_mutex = Lock()
+        self.compact_mutex = Lock()
+        self.validator = _VALIDATOR
+
+        self._jobs = None
+        self._next_id = 1
+        self._log_size = 0
+        self._compact_timer = None
+        # 종료 시 로그를 Job.json에 합친다.
+        atexit.register(self.compact)
+
+        self._save_queue = queue.Queue()
+        self._save_worker = Thread(target=self.__run_save_worker, daemon=True)
+        self._save_worker.start()
+
+    def __load(self):
+        """
+        Job.json을 메모리로 불러온 다음, 로그 파일의 변경 사항을 순서대로 반영하기
+        처음 접근할 때 한번만 수행된다.
+        """
+        @lock_while_using_file(self.rwlock.writer)
+        def __load_from_database():
+            if self._jobs is not None:
+                return
+            storage = self.__read_from_database()
+            jobs = {job['job_id']: job for job in storage['jobs']}
+            # 삭제된 Job의 job id가 다시 발급되지 않도록 저장해둔 next_id까지 고려한다.
+            last_id = max(max(jobs, default=0), storage.get('next_id', 1) - 1)
+            # 압축 도중 종료된 경우 옮겨둔 로그가 남아있으므로 먼저 반영한다.
+            # 이미 Job.json에 반영된 기록을 다시 반영해도 결과는 같다.
+            if os.path.exists(JOB_DATABASE_OLD_LOG_ROOT):
+                records, _ = self.__read_log(JOB_DATABASE_OLD_LOG_ROOT)
+                for record in records:
+                    self.__apply_log(jobs, record)
+                    last_id = max(last_id, record['job_id'])
+                # 옮겨둔 로그까지 반영된 Job.json을 만든 다음에 지워야 다음 압축에서 덮어쓰지 않는다.
+                self.__write_to_database(self.__dump_database(
+                    {'jobs': list(jobs.values()), 'next_id': last_id + 1}))
+                os.remove(JOB_DATABASE_OLD_LOG_ROOT)
+            # 아직 Job.json에 합쳐지지 않은 기록은 현재 로그 파일에 있는 것 뿐이다.
+            records, valid_size = self.__read_log(JOB_DATABASE_LOG_ROOT)
+            for record in records:
+                self.__apply_log(jobs, record)
+                last_id = max(last_id, record['job_id'])
+            log_size = len(records)
+            # 잘린 줄이 남아있으면 다음 기록이 그 뒤에 붙어서 같이 읽을 수 없게 되므로 잘라낸다.
+            if os.path.exists(JOB_DATABASE_LOG_ROOT) \
+                    and os.path.getsize(JOB_DATABASE_LOG_ROOT) > valid_size:
+                os.truncate(JOB_DATABASE_LOG_ROOT, valid_size)
+            self._next_id = last_id + 1
+            self._log_size = log_size
+            self._jobs = jobs
+            self.__schedule_compact()
+
+        if self._jobs is None:
+            __load_from_database()
+
+    def __schedule_compact(self):
+        """
+        로그가 Job 수의 COMPACT_RATIO배를 넘으면 로그 압축 예약
+        rwlock.writer를 잡은 상태에서 호출해야 한다.
+        이미 예약된 압축이 있으면 그 압축에 같이 반영된다.
+        """
+        if self._log_size <= COMPACT_RATIO * len(self._jobs):
+            return
+        if self._compact_timer is None:
+            self._compact_timer = Timer(COMPACT_DELAY, self.compact)
+            self._compact_timer.daemon = True
+            self._compact_timer.start()
+
+    def compact(self):
+        """
+        로그 파일의 변경 사항을 Job.json에 합친다.
+        지금까지의 로그를 옮겨두고 저장된 Job 목록을 얻는 것만 rwlock.reader를 잡은 상태에서 수행하고
+        데이터 변환과 파일 쓰기는 rwlock 없이 수행하여 그 동안에도 다른 요청을 처리할 수 있게 한다.
+        저장된 Job 데이터는 수정되지 않고 통째로 교체만 되므로 Lock 없이 변환해도 된다.
+        그 사이의 변경 사항은 새 로그 파일에 기록된다.
+        Job.json 쓰기에 실패하면 옮겨둔 로그와 _log_size를 그대로 두어 다음 압축에서 다시 합친다.
+        """
+        @lock_while_using_file(self.rwlock.reader)
+        def __rotate() -> (Optional[Dict[str, Any]], int):
+            """
+            :return: (Job.json에 쓸 데이터, 합쳐지는 로그 기록 수)
+            """
+            self._compact_timer = None
+            if not self._log_size:
+                return None, 0
+            # 로그 파일이 없으면 옮길 로그도 없으므로 Job.json만 갱신한다.
+            if os.path.exists(JOB_DATABASE_LOG_ROOT):
+                if os.path.exists(JOB_DATABASE_OLD_LOG_ROOT):
+                    # 이전 압축이 실패해서 아직 합쳐지지 않은 로그가 남아있으면 덮어쓰지 않고 뒤에 이어 붙인다.
+                    with JobDatabaseLogRead() as r, \
+                            JobDatabaseLogAppend(JOB_DATABASE_OLD_LOG_ROOT) as w:
+                        w.write(r.read())
+                    os.remove(JOB_DATABASE_LOG_ROOT)
+                else:
+                    os.replace(JOB_DATABASE_LOG_ROOT, JOB_DATABASE_OLD_LOG_ROOT)
+            storage = {'jobs': list(self._jobs.values()), 'next_id': self._next_id}
+            return storage, self._log_size
+
+        @lock_while_using_file(self.rwlock.writer)
+        def __release_log(log_size: int):
+            # 압축하는 동안 새로 기록된 로그는 남겨둔다.
+            self._log_size -= log_size
+
+        @lock_while_using_file(self.compact_mutex)
+        def __compact():
+            storage, log_size = __rotate()
+            if storage is not None:
+                self.__write_to_database(self.__dump_database(storage))
+                # Job.json에 모두 반영된 다음에 옮겨둔 로그를 지운다.
+                if os.path.exists(JOB_DATABASE_OLD_LOG_ROOT):
+                    os.remove(JOB_DATABASE_OLD_LOG_ROOT)
+                __release_log(log_size)
+
+        __compact()
 
     def reset(self):
         """
         Job.json 초기화, storage 초기화
         테스트 할 때만 사용
         """
-        self.__write_to_database({'jobs': []})
+        @lock_while_using_file(self.compact_mutex)
+        @lock_while_using_file(self.rwlock.writer)
+        def __reset():
+            if self._compact_timer is not None:
+                self._compact_timer.cancel()
+                self._compact_timer = None
+            self._jobs = dict()
+            self._next_id = 1
+            self._log_size = 0
+            self.__write_to_database(self.__dump_database({'jobs': [], 'next_id': 1}))
+            for root in (JOB_DATABASE_LOG_ROOT, JOB_DATABASE_OLD_LOG_ROOT):
+                if os.path.exists(root):
+                    os.remove(root)
+
+        __reset()
 
         # 모든 csv 파일을 삭제하고
         BASE_DIR = 'storage/data'
@@ -78,6 +351,55 @@ class JobDatabaseEngine:
         })
         df.to_csv(f'{BASE_DIR}/a.csv', index=False)
 
+    def __run_save_worker(self):
+        """
+        대기열에 쌓인 저장 요청을 꺼내서 처리하는 쓰레드
+        요청이 처리되는 동안 새로 들어온 요청은 다음 번에 한꺼번에 처리된다.
+        """
+        @lock_while_using_file(self.rwlock.writer)
+        def __save(jobs: List[Dict[str, Any]]) -> List[int]:
+            """
+            메모리에 저장하고 로그 파일에 한번에 기록
+            Mutex Decorator를 적용하기 위해 데이터에 접근하는 함수를 따로 구현함
+
+            :return: 생성된 Job들의 고유 아이디
+            """
+            # job id 발급
+            new_job_ids = list(range(self._next_id, self._next_id + len(jobs)))
+            # 호출한 곳의 데이터는 건드리지 않고, job_id를 추가한 복사본을 저장한다.
+            stored_jobs = [dict(job, job_id=new_job_id)
+                           for job, new_job_id in zip(jobs, new_job_ids)]
+            # 로그 파일에 기록, 실패하면 job id 발급과 storage 추가를 하지 않는다.
+            self.__write_to_log(stored_jobs)
+            # storage에 추가
+            self._next_id += len(jobs)
+            for stored_job in stored_jobs:
+                self._jobs[stored_job['job_id']] = stored_job
+            self.__schedule_compact()
+            return new_job_ids
+
+        while True:
+            # 요청이 올 때까지 기다린 다음, 그 사이에 쌓인 요청을 같이 꺼낸다.
+            requests: List[Tuple[Dict[str, Any], Future]] = [self._save_queue.get()]
+            while len(requests) < SAVE_BATCH_SIZE:
+                try:
+                    requests.append(self._save_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                new_job_ids = __save([job for job, _ in requests])
+            except Exception as e:
+                # 기다리던 요청들이 같은 Exception을 동시에 raise하면 Traceback이 서로 덮어써지므로
+                # 요청마다 복사본을 넘기고, 원래 Exception은 __cause__로 남긴다.
+                for _, future in requests:
+                    err = copy.copy(e)
+                    err.__cause__ = e
+                    future.set_exception(err)
+            else:
+                for (_, future), new_job_id in zip(requests, new_job_ids):
+                    future.set_result(new_job_id)
+
     def save(self, job: Dict[str, Any]) \
         -> int:
         """
@@ -88,37 +410,19 @@ class JobDatabaseEngine:
         :exception ValieError: 추가하려는 데이터가 잘못된 경우
         """
 
-        def __set_job_id(job_list_size: int):
-            return 1 if job_list_size == 0 else job_list_size + 1
-
-        @lock_while_using_file(self.mutex)
-        def __save() -> int:
-            """
-            실제 파일에 저장
-            Mutex Decorator를 적용하기 위해 파일 접근하는 함수를 따로 구현함
-
-            :return: 생성된 Job의 고유 아이디
-            """
-            # 데이터 가져오기
-            storage = self.__read_from_database()
-            # job id 발급
-            new_job_id = __set_job_id(len(storage['jobs']))
-            # job_id를 job에 추가 및 storage에 추가
-            job['job_id'] = new_job_id
-            storage['jobs'].append(job)
-            # 파일에 작성
-            self.__write_to_database(storage)
-            # job_id 리턴
-            return new_job_id
-
         # Validate 판정
         is_valid, err = self.validator(job)
-        if err:
-            raise err
-        elif not is_valid:
-            raise ValueError("Validate Failed")
+        if not is_valid:
+            # 검증 결과가 코드인 경우 실패했을 때만 Exception을 생성한다.
+            if isinstance(err, Exception):
+                raise err
+            raise ValueError(JOB_ERROR_MESSAGES.get(err, "Validate Failed"))
         # 에러 발생 시 바로 보냄
-        return __save()
+        self.__load()
+        # 저장은 _save_worker가 다른 요청과 같이 처리하며, 끝날 때까지 기다린다.
+        future = Future()
+        self._save_queue.put((job, future))
+        return future.result()
 
     def update(self, job_id: int, updated_data: Dict[str, Any]) \
             -> bool:
@@ -130,13 +434,10 @@ class JobDatabaseEngine:
         :return: (성공 여부, 에러 내용(없으면  None))
         """
 
-        @lock_while_using_file(self.mutex)
+        @lock_while_using_file(self.rwlock.writer)
         def __update():
-            all_data = self.__read_from_database()
-            storage = all_data['jobs']
             # search data
-            is_exists, idx = search_job_by_binary_search(storage, job_id)
-            if not is_exists:
+            if job_id not in self._jobs:
                 raise ValueError('Data Not Found')
             # validate data
             is_valid, err = self.validator(updated_data)
@@ -144,13 +445,15 @@ class JobDatabaseEngine:
                 return False
             if err:
                 raise err
+            # save, 호출한 곳의 데이터는 건드리지 않고 job_id를 추가한 복사본을 저장한다.
+            stored_job = dict(updated_data, job_id=job_id)
+            self.__write_to_log([stored_job])
             # update
-            updated_data['job_id'] = job_id
-            all_data['jobs'][idx] = updated_data
-            # save
-            self.__write_to_database(all_data)
+            self._jobs[job_id] = stored_job
+            self.__schedule_compact()
             return True
 
+        self.__load()
         return __update()
 
     def get_item(self, job_id: int) -> Dict[str, Any]:
@@ -159,26 +462,19 @@ class JobDatabaseEngine:
 
         :param job_id: 찾고자 하는 Job의 ID
 
-        :return:  job id에 데한 정보
+        :return:  job id에 데한 정보, 메모리에 저장된 데이터를 복사하지 않고 그대로 돌려주므로
+            호출하는 쪽에서 절대 수정하면 안된다. (수정이 필요하면 복사해서 사용한다.)
 
         :exception ValueError: 찾고자 하는 데이터가 없음
         :exception Exception: 주로 job.json파일이 없어서 발생하는 에러
         """
 
-        @lock_while_using_file(self.mutex)
-        def __get_item() -> Optional[Dict[str, Any]]:
-            """
-            파일에 직접 접근하여 데이터 구하기
-            :return: Job_ID에 대한 정보, 못찾으면 None Return
-            """
-            storage = self.__read_from_database()['jobs']
-            # idx -> job_id의 데이터가 위치해 있는 인덱스 값
-            is_exists, idx = search_job_by_binary_search(storage, job_id)
-            return storage[idx] if is_exists else None
-
-        # 파일에 접근해서 데이터 찾기
+        # 메모리에 있는 데이터에서 찾기
+        # 쓰기 작업은 저장된 Job 데이터를 직접 고치지 않고 dict의 항목을 통째로 추가/교체/삭제만 하며
+        # dict.get은 한번에 수행되기 때문에 Lock 없이 읽어도 완성된 데이터만 얻게 된다.
         # 에러 발생은 View에서처리
-        res = __get_item()
+        self.__load()
+        res = self._jobs.get(job_id)
         if not res:
             raise ValueError(f'Failed to find id: {job_id}')
         return res
@@ -192,28 +488,25 @@ class JobDatabaseEngine:
         :return: 
         """
 
-        @lock_while_using_file(self.mutex)
+        @lock_while_using_file(self.rwlock.writer)
         def __remove() -> bool:
-            # Json에서 데이터 가져오기
-            all_data = self.__read_from_database()
-            storage = all_data['jobs']
             # 삭제할 데이터 검색
-            is_exists, idx = search_job_by_binary_search(storage, job_id)
-            if not is_exists:
+            if job_id not in self._jobs:
                 return False
-            # 데이터 삭제 및 파일 갱신
-            del storage[idx]
-            all_data['jobs'] = storage
-            self.__write_to_database(all_data)
+            # 로그 파일에 기록 및 데이터 삭제
+            self.__write_to_log([{'job_id': job_id}])
+            del self._jobs[job_id]
+            self.__schedule_compact()
             return True
 
         # 에러는 view에서 처리
+        self.__load()
         success = __remove()
         return True if success else False
 
     def run(self, job_id: int):
 
-        @lock_while_using_file(self.mutex)
+        @lock_while_using_file(self.task_mutex)
         def __run(job_data):
             TaskWorker(job_data)()
 
@@ -1,15 +1,34 @@
-from libs.resource_access import RawFileRead, RawFileWrite
+from libs.resource_access import RawFileBinaryRead, RawFileBinaryAppend, RawFileAtomicWrite
 
 JOB_DATABASE_ROOT = 'storage/jobs.json'
 
+"""
+Job.json 이후의 변경 사항을 한 줄씩 이어서 기록하는 로그 파일
+압축 중에는 기존 로그를 JOB_DATABASE_OLD_LOG_ROOT로 옮겨둔다.
+"""
+JOB_DATABASE_LOG_ROOT = f'{JOB_DATABASE_ROOT}.log'
+JOB_DATABASE_OLD_LOG_ROOT = f'{JOB_DATABASE_LOG_ROOT}.old'
 
-class JobDatabaseRead(RawFileRead):
+
+class JobDatabaseRead(RawFileBinaryRead):
 
     def __init__(self):
         super().__init__(JOB_DATABASE_ROOT)
 
 
-class JobDatabaseWrite(RawFileWrite):
+class JobDatabaseWrite(RawFileAtomicWrite):
 
     def __init__(self):
         super().__init__(JOB_DATABASE_ROOT)
+
+
+class JobDatabaseLogRead(RawFileBinaryRead):
+
+    def __init__(self, file_root: str = JOB_DATABASE_LOG_ROOT):
+        super().__init__(file_root)
+
+
+class JobDatabaseLogAppend(RawFileBinaryAppend):
+
+    def __init__(self, file_root: str = JOB_DATABASE_LOG_ROOT):
+        super().__init__(file_root)
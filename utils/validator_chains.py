@@ -1,4 +1,8 @@
-from libs.validator import AutomaticValidator, ValidatorChain
+import hashlib
+import orjson
+from typing import Dict, List, Tuple
+
+from libs.validator import AutomaticValidator, CachedValidator, ValidatorChain
 from utils.validator_logics.job_validator_logics import *
 
 
@@ -8,12 +12,35 @@ def get_job_validator_chain() \
     Job Data 유효성을 측정하기 위한 ValidatorChain
     """
     validator_chain = ValidatorChain()
+    # 그래프 검증 결과는 property와 상관없이 그래프 구조로만 결정되므로
+    # 같은 구조의 job_list는 이전 검증 결과를 재사용한다.
     validator_chain.add_validator(
-        AutomaticValidator(validate_logic=validate_job_list),
+        CachedValidator(AutomaticValidator(validate_logic=validate_job_list),
+                        key=get_job_list_cache_key),
         lambda job: (job['task_list'],)
     )
     validator_chain.add_validator(
         AutomaticValidator(validate_logic=validate_job_properties),
         lambda job: (list(job['task_list'].keys()), job['property'])
     )
-    return validator_chain
\ No newline at end of file
+    return validator_chain
+
+
+def get_job_list_cache_key(graph: Dict[str, List[str]]) \
+        -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    job_list의 검증 결과를 캐시할 때 사용하는 key
+    정점, 간선의 순서와 상관없이 그래프 구조가 같으면 같은 key가 나온다.
+    """
+    return tuple(sorted((u, tuple(sorted(vs))) for u, vs in graph.items()))
+
+
+def get_job_cache_key(job) -> bytes:
+    """
+    Job Data의 검증 결과를 캐시할 때 사용하는 key
+    key의 순서와 상관없이 내용이 같으면 같은 key가 나온다.
+    """
+    return hashlib.blake2b(
+        orjson.dumps(job, option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).digest()
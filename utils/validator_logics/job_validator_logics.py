@@ -1,60 +1,90 @@
+from enum import IntEnum
 from typing import Dict, List
-from utils.algorithms import topological_sort
+from utils.algorithms.topological_sort import check_graph, \
+    GRAPH_OK, GRAPH_NOT_ONE_GRAPH, GRAPH_NOT_ONE_DESTINATION, GRAPH_CYCLE, \
+    GRAPH_DOUBLE_EDGE, GRAPH_UNKNOWN_NODE, GRAPH_ERROR_MESSAGES
+
+
+class JobErrorCode(IntEnum):
+    """
+    Job Data 유효성 검사 결과 코드
+    검사에 실패할 때마다 Exception을 생성하지 않도록 코드로 결과를 돌려준다.
+    OK(0)를 제외한 나머지는 실패를 의미한다.
+    """
+    OK = GRAPH_OK
+    NOT_ONE_GRAPH = GRAPH_NOT_ONE_GRAPH
+    NOT_ONE_DESTINATION = GRAPH_NOT_ONE_DESTINATION
+    CYCLE = GRAPH_CYCLE
+    DOUBLE_EDGE = GRAPH_DOUBLE_EDGE
+    UNKNOWN_TASK = GRAPH_UNKNOWN_NODE
+    PROPERTY_MISMATCH = 6
+    PROPERTY_TASK_NAME = 7
+    PROPERTY_READ = 8
+    PROPERTY_WRITE = 9
+    PROPERTY_DROP = 10
+
+
+"""
+결과 코드에 대한 에러 메세지
+실제로 Exception이 필요할 때만 사용한다.
+"""
+JOB_ERROR_MESSAGES = {
+    **{JobErrorCode(code): msg for code, msg in GRAPH_ERROR_MESSAGES.items()},
+    JobErrorCode.PROPERTY_MISMATCH: "jobs and properties does not equal",
+    JobErrorCode.PROPERTY_TASK_NAME: "task_name은 read, write, drop 중 하나여야 합니다.",
+    JobErrorCode.PROPERTY_READ: "read의 property는 filename, sep 이어야 합니다.",
+    JobErrorCode.PROPERTY_WRITE: "write의 property는 filename, sep 이어야 합니다.",
+    JobErrorCode.PROPERTY_DROP: "drop의 property는 column_name 이어야 합니다.",
+}
 
 
 def validate_job_list(graph: Dict[str, List[str]])  \
-        -> bool:
+        -> JobErrorCode:
     """
     job_list 의 유효성을 판단하는 함수
     :param graph:
-    :return:
+    :return: 결과 코드
     """
-    topological_sort(graph)
-    return True
+    code, _ = check_graph(graph)
+    return JobErrorCode(code)
+
+
+"""
+task 종류별로 property에 있어야 하는 key와 key가 맞지 않을 때의 결과 코드
+read/write: filename, sep이 있어야 한다
+drop: column_name이 있어야 한다.
+"""
+PROPERTY_KEYS = {
+    'read': (frozenset({'task_name', 'filename', 'sep'}),
+             JobErrorCode.PROPERTY_READ),
+    'write': (frozenset({'task_name', 'filename', 'sep'}),
+              JobErrorCode.PROPERTY_WRITE),
+    'drop': (frozenset({'task_name', 'column_name'}),
+             JobErrorCode.PROPERTY_DROP),
+}
 
 
 def validate_job_properties(job_names: List[str],
                             properties: Dict[str, Dict[str, str]])  \
-        -> bool:
+        -> JobErrorCode:
     """
     job property의 유효성을 판단하는 함수
     :param job_names:
     :param properties:
-    :return:
+    :return: 결과 코드
     """
 
-    def __check_property(p: Dict[str, str], needs: Dict[str, str])  \
-            -> bool:
-
-        # task_name이 반드시 property 안에 들어가야 한다.
-        if 'task_name' not in p:
-            return False
-        # task_name은 read/write/drop 중 하나여야만 한다
-        if p['task_name'] not in set(needs.keys()):
-            return False
-        # task_name 갖고오기
-        task_name = p['task_name']
-
-        """
-        read/write: filename, sep이 있어야 한다
-        drop: column_name이 있어야 한다.
-        """
-
-        if (needs[task_name] | {'task_name'}) != set(p.keys()):
-            return False
-        return True
-
-    needs = {
-        'read': {'filename', 'sep'},
-        'write': {'filename', 'sep'},
-        'drop': {'column_name'},
-    }
-
     # jobs_names의 내용과 properties key의 데이터가 정확히 일치해야 한다
-    if set(job_names) != set(properties):
-        raise ValueError("jobs and properties does not equal")
+    if set(job_names) != properties.keys():
+        return JobErrorCode.PROPERTY_MISMATCH
 
     for p in properties.values():
-        if not __check_property(p, needs):
-            return False
-    return True
+        # task_name은 read/write/drop 중 하나여야만 하고
+        # property에는 task 종류에 맞는 key만 정확히 들어가야 한다.
+        needs = PROPERTY_KEYS.get(p.get('task_name'))
+        if needs is None:
+            return JobErrorCode.PROPERTY_TASK_NAME
+        keys, err_code = needs
+        if keys != p.keys():
+            return err_code
+    return JobErrorCode.OK